@@ -14,22 +14,109 @@ This file is go1 standalone python file.
 import argparse
 import json
 import os
+import sys
 import numpy as np
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+
+    def njit(*_args, **_kwargs):
+        """[summary]
+            Fallback decorator that leaves the function untouched without numba
+        """
+        return lambda func: func
+
+
+parser = argparse.ArgumentParser(description="a1 quadruped demo")
+parser.add_argument("-w",
+                    "--waypoint",
+                    type=str,
+                    metavar="",
+                    required=False,
+                    help="file path to the waypoints")
+parser.add_argument("--headless",
+                    action="store_true",
+                    help="run the simulation without a viewport")
+parser.add_argument("--render-every",
+                    type=int,
+                    default=1,
+                    metavar="",
+                    help="render every n-th frame, frames in between run "
+                    "physics only")
+args, unknown = parser.parse_known_args()
+if args.render_every < 1:
+    parser.error("--render-every must be at least 1")
+
+
+def load_waypoints(file_path) -> np.ndarray:
+    """[summary]
+        Parse the waypoint json file
+        Argument:
+        file_path {str} -- file path to the waypoints
+        Returns:
+        np.ndarray -- (N, 3) x coordinate, y coordinate, heading (in rad)
+    """
+    if orjson is not None:
+        with open(file_path, "rb") as file:
+            waypoint_data = orjson.loads(file.read())
+    else:
+        with open(file_path, encoding="utf-8") as file:
+            waypoint_data = json.load(file)
+    poses = np.empty((len(waypoint_data), 3), dtype=np.float64)
+    for i, waypoint in enumerate(waypoint_data):
+        poses[i, 0] = waypoint["x"]
+        poses[i, 1] = waypoint["y"]
+        poses[i, 2] = waypoint["rad"]
+    return poses
+
+
+# parse the waypoints before starting isaac sim, so bad inputs fail fast
+waypoint_pose = None
+if args.waypoint:
+    print(str(args.waypoint))
+    try:
+        waypoint_pose = load_waypoints(str(args.waypoint))
+    except FileNotFoundError:
+        print("error file not found, ending")
+        sys.exit(1)
+
 from omni.isaac.kit import SimulationApp
 
-simulation_app = SimulationApp({"headless": False})
+simulation_app = SimulationApp({"headless": args.headless})
 
 from omni.isaac.core import World
 from omni.isaac.core.utils.prims import define_prim
 from omni.isaac.core.utils.prims import get_prim_at_path
-from omni.isaac.core.utils.nucleus import get_assets_root_path
 import omni.appwindow  # Contains handle to keyboard
 
 import carb
+from utils.assets import get_cached_assets_root_path
 from utils.unitree import Unitree
 
 
+@njit(cache=True)
+def _accumulate_cmd(held, deltas, out):
+    """[summary]
+        Sum the command deltas of every held key into out.
+        Argument:
+        held {np.ndarray} -- int8 held state per key
+        deltas {np.ndarray} -- (num keys, 3) command delta per key
+        out {np.ndarray} -- x velocity, y velocity, angular velocity
+    """
+    out[:] = 0.0
+    for i in range(held.shape[0]):
+        if held[i]:
+            out[0] += deltas[i, 0]
+            out[1] += deltas[i, 1]
+            out[2] += deltas[i, 2]
+
+
 class Go1Runner(object):
     """[summary]
         Main class to run the simulation
@@ -41,13 +128,13 @@ class Go1Runner(object):
             Argument:
             physics_dt {float} -- Physics downtime of the scene.
             render_dt {float} -- Render downtime of the scene.
-            way_points {List[List[float]]} -- x coordinate, y coordinate, heading (in rad)
+            way_points {np.ndarray} -- (N, 3) x coordinate, y coordinate, heading (in rad)
         """
         self._world = World(stage_units_in_meters=1.0,
                             physics_dt=physics_dt,
                             rendering_dt=render_dt)
 
-        assets_root_path = get_assets_root_path()
+        assets_root_path = get_cached_assets_root_path()
         if assets_root_path is None:
             carb.log_error("Could not find Isaac Sim assets folder")
 
@@ -89,11 +176,13 @@ class Go1Runner(object):
                     use_ros=True))
 
         self._world.reset()
-        self._enter_toggled = 0
-        self._base_command = [0.0, 0.0, 0.0, 0]
+        # physics steps advanced by one rendered world step
+        self._steps_per_render = max(1, int(round(render_dt / physics_dt)))
+        self._enter_toggled = False
+        self._base_command = np.zeros(4, dtype=np.float32)
         self._event_flag = False
         # bindings for keyboard to command
-        self._input_keyboard_mapping = {
+        input_keyboard_mapping = {
             # forward command
             "NUMPAD_8": [1.8, 0.0, 0.0],
             "UP": [1.8, 0.0, 0.0],
@@ -113,6 +202,15 @@ class Go1Runner(object):
             "NUMPAD_9": [0.0, 0.0, -1.0],
             "M": [0.0, 0.0, -1.0],
         }
+        # stack the command deltas once into one row per key
+        self._key_names = list(input_keyboard_mapping.keys())
+        self._deltas = np.stack([
+            np.asarray(input_keyboard_mapping[name], dtype=np.float32)
+            for name in self._key_names
+        ])
+        self._held = np.zeros(len(self._key_names), np.int8)
+        # compile the kernel now instead of inside the first physics step
+        _accumulate_cmd(self._held, self._deltas, self._base_command[0:3])
 
     @property
     def world(self) -> World:
@@ -123,15 +221,21 @@ class Go1Runner(object):
 
     def setup(self, way_points=None) -> None:
         """[summary]
-            Set unitree robot's default stance, set up keyboard listener and add physics callback
+            Set up keyboard polling and add physics callback, the default stance is set by the following world reset
         """
 
-        self._robot.set_state(self._robot.default_a1_state)
         self._appwindow = omni.appwindow.get_default_app_window()
         self._input = carb.input.acquire_input_interface()
         self._keyboard = self._appwindow.get_keyboard()
-        self._sub_keyboard = self._input.subscribe_to_keyboard_events(
-            self._keyboard, self._sub_keyboard_event)
+        # the keyboard state is sampled after every rendered step instead of
+        # being accumulated from key press/release events
+        self._keyboard_inputs = [
+            getattr(carb.input.KeyboardInput, name) for name in self._key_names
+        ]
+        self._enter_input = carb.input.KeyboardInput.ENTER
+        # bind the robot calls made on every physics step once
+        self._switch_mode = self._robot.qp_controller.switch_mode
+        self._advance = self._robot.advance
         self._world.add_physics_callback("a1_advance",
                                          callback_fn=self.on_physics_step)
 
@@ -146,103 +250,79 @@ class Go1Runner(object):
         """
 
         if self._event_flag:
-            self._robot.qp_controller.switch_mode()
+            self._switch_mode()
             self._event_flag = False
 
-        self._robot.advance(step_size, self._base_command, self._path_follow)
+        self._advance(step_size, self._base_command, self._path_follow)
 
-    def run(self) -> None:
+    def run(self, render_every=1) -> None:
         """[summary]
             Step simulation based on rendering downtime
+            Argument:
+            render_every {int} -- render every n-th frame, frames in between advance the same render_dt with physics only
         """
+        # bind the per-frame calls to locals, the loop runs for every frame
+        step = self._world.step
+        is_running = simulation_app.is_running
+        poll_keyboard = self._poll_keyboard
+        steps_per_render = self._steps_per_render
+        frame_count = 0
         # change to sim running
-        while simulation_app.is_running():
-            self._world.step(render=True)
-
-    def _sub_keyboard_event(self, event) -> bool:
+        while is_running():
+            if frame_count % render_every == 0:
+                step(render=True)
+                # kit refreshes the keyboard state once per app update, the
+                # command applies to the physics steps of the next frame
+                poll_keyboard()
+            else:
+                # a physics only step advances one physics_dt, run as many as
+                # a rendered step so every frame covers render_dt
+                for _ in range(steps_per_render):
+                    step(render=False)
+            frame_count += 1
+
+    def _poll_keyboard(self) -> None:
         """[summary]
-            Keyboard subscriber callback to when kit is updated.
+            Rebuild the command from the keys currently held down.
         """
-        # reset event
-        self._event_flag = False
-        # when a key is pressed for released  the command is adjusted w.r.t the key-mapping
-        if event.type == carb.input.KeyboardEventType.KEY_PRESS:
-            # on pressing, the command is incremented
-            if event.input.name in self._input_keyboard_mapping:
-                self._base_command[0:3] += np.array(
-                    self._input_keyboard_mapping[event.input.name])
+        # resolve the carb bindings once per poll instead of once per key
+        get_button_flags = self._input.get_keyboard_button_flags
+        keyboard = self._keyboard
+        flag_down = carb.input.BUTTON_FLAG_DOWN
+        held_keys = self._held
+
+        # the command is the sum of the key-mapping of every held key
+        for i, key in enumerate(self._keyboard_inputs):
+            held = bool(get_button_flags(keyboard, key) & flag_down)
+            if held != held_keys[i]:
+                held_keys[i] = held
                 self._event_flag = True
+        _accumulate_cmd(held_keys, self._deltas, self._base_command[0:3])
 
-            # enter, toggle the last command
-            if event.input.name == "ENTER" and self._enter_toggled is False:
+        # enter, toggle the last command once per press
+        if get_button_flags(keyboard, self._enter_input) & flag_down:
+            if not self._enter_toggled:
                 self._enter_toggled = True
-                if self._base_command[3] == 0:
-                    self._base_command[3] = 1
-                else:
-                    self._base_command[3] = 0
+                self._base_command[3] = 1 - int(self._base_command[3])
                 self._event_flag = True
-
-        elif event.type == carb.input.KeyboardEventType.KEY_RELEASE:
-            # on release, the command is decremented
-            if event.input.name in self._input_keyboard_mapping:
-                self._base_command[0:3] -= np.array(
-                    self._input_keyboard_mapping[event.input.name])
-                self._event_flag = True
-            # enter, toggle the last command
-            if event.input.name == "ENTER":
-                self._enter_toggled = False
-        # since no error, we are fine :)
-        return True
-
-
-parser = argparse.ArgumentParser(description="a1 quadruped demo")
-parser.add_argument("-w",
-                    "--waypoint",
-                    type=str,
-                    metavar="",
-                    required=False,
-                    help="file path to the waypoints")
-args, unknown = parser.parse_known_args()
+        else:
+            self._enter_toggled = False
 
 
 def main():
     """[summary]
-        Parse arguments and instantiate A1 runner
+        Instantiate A1 runner with the waypoints parsed before startup
     """
     physics_downtime = 1 / 400.0
-    if args.waypoint:
-        waypoint_pose = []
-        try:
-            print(str(args.waypoint))
-            with open(str(args.waypoint), encoding="utf-8") as file:
-                waypoint_data = json.load(file)
-                for waypoint in waypoint_data:
-                    waypoint_pose.append(
-                        np.array(
-                            [waypoint["x"], waypoint["y"], waypoint["rad"]]))
-            # print(str(waypoint_pose))
-
-        except FileNotFoundError:
-            print("error file not found, ending")
-            simulation_app.close()
-            return
-
-        runner = Go1Runner(physics_dt=physics_downtime,
-                           render_dt=16 * physics_downtime,
-                           way_points=waypoint_pose)
-        simulation_app.update()
-        runner.setup(way_points=waypoint_pose)
-    else:
-        runner = Go1Runner(physics_dt=physics_downtime,
-                           render_dt=16 * physics_downtime,
-                           way_points=None)
-        simulation_app.update()
-        runner.setup(None)
+    runner = Go1Runner(physics_dt=physics_downtime,
+                       render_dt=16 * physics_downtime,
+                       way_points=waypoint_pose)
+    simulation_app.update()
+    runner.setup(way_points=waypoint_pose)
 
-    # an extra reset is needed to register
-    runner.world.reset()
+    # one extra reset is needed to register the physics callback
     runner.world.reset()
-    runner.run()
+    runner.run(render_every=args.render_every)
     simulation_app.close()
 
 
@@ -0,0 +1,86 @@
+"""
+This file is for resolving the isaac sim assets root path.
+"""
+
+import functools
+import json
+import pathlib
+from typing import Optional
+
+from omni.isaac.core.utils.nucleus import get_assets_root_path
+from omni.isaac.version import get_version
+import carb
+import omni.client
+
+# assets root path resolved by a previous run, with the key it was resolved for
+ASSETS_ROOT_CACHE = pathlib.Path("~/.cache/qnai_assets_root").expanduser()
+ASSET_ROOT_SETTING = "/persistent/isaac/asset_root/default"
+
+
+def _cache_key() -> dict:
+    """[summary]
+    Returns the isaac sim version and asset root setting the cached path was resolved for
+    """
+    return {
+        "version": [str(part) for part in get_version()],
+        "asset_root_setting":
+            carb.settings.get_settings().get(ASSET_ROOT_SETTING),
+    }
+
+
+def _read_cache(cache_key) -> Optional[str]:
+    """[summary]
+    Returns the cached assets root path, None if there is none for cache_key
+    """
+    try:
+        cache = json.loads(ASSETS_ROOT_CACHE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get("key") != cache_key:
+        return None
+    return cache.get("assets_root_path") or None
+
+
+def _write_cache(cache_key, assets_root_path) -> None:
+    """[summary]
+    Persist the resolved assets root path together with its cache key
+    """
+    try:
+        ASSETS_ROOT_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        cache = {"key": cache_key, "assets_root_path": assets_root_path}
+        ASSETS_ROOT_CACHE.write_text(json.dumps(cache), encoding="utf-8")
+    except OSError:
+        carb.log_warn("Could not cache assets root path in " +
+                      str(ASSETS_ROOT_CACHE))
+
+
+def _is_reachable(assets_root_path) -> bool:
+    """[summary]
+    Returns true if the isaac assets folder under assets_root_path can be reached
+    """
+    result, _ = omni.client.stat(assets_root_path + "/Isaac")
+    return result == omni.client.Result.OK
+
+
+@functools.lru_cache(maxsize=1)
+def get_cached_assets_root_path() -> Optional[str]:
+    """[summary]
+    Returns the isaac sim assets root path, reusing the one resolved by a previous run
+    The cached path is only reused for the same isaac sim version and asset root
+    setting, and only while its isaac assets folder is reachable.
+
+    Returns:
+        str: assets root path, None if it could not be resolved.
+    """
+    cache_key = _cache_key()
+    assets_root_path = _read_cache(cache_key)
+    if assets_root_path is not None:
+        if _is_reachable(assets_root_path):
+            return assets_root_path
+        carb.log_warn("Cached assets root path " + assets_root_path +
+                      " is not reachable, resolving it again")
+
+    assets_root_path = get_assets_root_path()
+    if assets_root_path is not None:
+        _write_cache(cache_key, assets_root_path)
+    return assets_root_path
@@ -16,7 +16,6 @@ from collections import deque
 import numpy as np
 
 from omni.isaac.core.utils.extensions import enable_extension
-from omni.isaac.core.utils.nucleus import get_assets_root_path
 from omni.isaac.core.utils.prims import get_prim_at_path, define_prim
 from omni.isaac.core.utils.stage import get_current_stage, get_stage_units
 from omni.isaac.core.articulations import Articulation
@@ -25,6 +24,7 @@ from omni.isaac.quadruped.controllers import A1QPController
 from omni.isaac.sensor import ContactSensor
 import carb
 
+from utils.assets import get_cached_assets_root_path
 from utils.omnigraph import OmnigraphHelper
 
 
@@ -69,7 +69,7 @@ class Unitree(Articulation):
             if usd_path:
                 prim.GetReferences().AddReference(usd_path)
             else:
-                assets_root_path = get_assets_root_path()
+                assets_root_path = get_cached_assets_root_path()
                 if assets_root_path is None:
                     carb.log_error("Could not find Isaac Sim assets server")
                 if model == "A1":
@@ -97,7 +97,7 @@ class Unitree(Articulation):
             [0.0, 1.2, -1.8, 0, 1.2, -1.8, 0.0, 1.2, -1.8, 0, 1.2, -1.8])
         self._default_a1_state.joint_vel = np.zeros(12)
 
-        self._goal = np.zeros(3)
+        self._goal = np.zeros(4, dtype=np.float32)
         self.meters_per_unit = get_stage_units()
 
         super().__init__(prim_path=self._prim_path,
@@ -156,7 +156,7 @@ class Unitree(Articulation):
 
         # Controller
         self.physics_dt = physics_dt
-        if way_points:
+        if way_points is not None and len(way_points) > 0:
             self._qp_controller = A1QPController(model, self.physics_dt,
                                                  way_points)
         else:
@@ -299,18 +299,17 @@ class Unitree(Articulation):
         compute desired torque and set articulation effort to robot joints
         Argument:
         dt {float} -- Timestep update in the world.
-        goal {List[int]} -- x velocity, y velocity, angular velocity, state switch
+        goal {np.ndarray} -- x velocity, y velocity, angular velocity, state switch
         path_follow {bool} -- true for following coordinates, false for keyboard control
         auto_start {bool} -- true for start trotting after 1 sec, false for start trotting after switch mode function is called
         Returns:
         np.ndarray -- The desired joint torques for the robot.
         """
-        if goal is None:
-            goal = self._goal
-        else:
-            self._goal = goal
+        if goal is not None:
+            # copy into the persistent goal buffer, no reconversion per step
+            self._goal[:] = goal
         self.update()
-        self._qp_controller.set_target_command(goal)
+        self._qp_controller.set_target_command(self._goal)
 
         self._command.desired_joint_torque = self._qp_controller.advance(
             dt, self._measurement, path_follow, auto_start)